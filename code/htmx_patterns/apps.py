@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class HtmxPatternsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "htmx_patterns"
+
+    def ready(self):
+        from . import cache_versions
+        from .models import Monster
+
+        cache_versions.register_model(Monster)
@@ -0,0 +1,118 @@
+"""
+Cross-process cache invalidation using version numbers.
+
+Each tag (normally a model label like "htmx_patterns.Monster") has a
+monotonically increasing version number, stored in a small local SQLite
+database (CACHE_VERSIONS_DB setting), so that it is shared between all worker
+processes on the machine without needing an external service.
+
+Versions are bumped after any save or delete of registered models (see
+`register_model`), and must be bumped manually after bulk operations that
+don't send signals (`QuerySet.update()`, raw SQL etc.), using `bump_version`.
+
+Anything memoized per process that derives from model data should include
+the current version in its key (see `count_cached`), so that it is recomputed
+after changes made by any process.
+"""
+
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save
+
+_local = threading.local()
+
+
+def _connection() -> sqlite3.Connection:
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        # Autocommit mode. Each statement is atomic, which is all we need.
+        connection = sqlite3.connect(settings.CACHE_VERSIONS_DB, timeout=10, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS cache_versions (tag TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+        _local.connection = connection
+    return connection
+
+
+def get_tag(model_or_tag: type[Model] | str) -> str:
+    return model_or_tag if isinstance(model_or_tag, str) else model_or_tag._meta.label
+
+
+def get_version(model_or_tag: type[Model] | str) -> int:
+    """
+    Returns the current version for the tag or model, which is 0 if it has
+    never been bumped.
+    """
+    row = _connection().execute("SELECT version FROM cache_versions WHERE tag = ?", (get_tag(model_or_tag),)).fetchone()
+    return row[0] if row is not None else 0
+
+
+def get_versions(models_or_tags) -> tuple[int, ...]:
+    return tuple(get_version(model_or_tag) for model_or_tag in models_or_tags)
+
+
+def bump_version(model_or_tag: type[Model] | str):
+    """
+    Increments the version for the tag or model, once the current database
+    transaction (if any) commits.
+    """
+    # Bumping before the commit would allow another process to see the new
+    # version, recompute and memoize a value using the old data.
+    tag = get_tag(model_or_tag)
+    transaction.on_commit(lambda: _bump_version_now(tag))
+
+
+def _bump_version_now(tag: str):
+    _connection().execute(
+        "INSERT INTO cache_versions (tag, version) VALUES (?, 1) "
+        "ON CONFLICT (tag) DO UPDATE SET version = version + 1",
+        (tag,),
+    )
+
+
+def register_model(model: type[Model]):
+    """
+    Bump the version for `model` whenever an instance is saved or deleted
+    """
+    post_save.connect(_bump_for_instance, sender=model, dispatch_uid=f"cache_versions_save_{get_tag(model)}")
+    post_delete.connect(_bump_for_instance, sender=model, dispatch_uid=f"cache_versions_delete_{get_tag(model)}")
+
+
+def _bump_for_instance(sender, **kwargs):
+    bump_version(sender)
+
+
+# Maximum number of distinct querysets to remember counts for, per process
+COUNT_CACHE_SIZE = 1000
+
+_counts_lock = threading.Lock()
+# (db alias, sql, params) -> (version, count), least recently used first
+_counts: OrderedDict[tuple, tuple[int, int]] = OrderedDict()
+
+
+def count_cached(queryset) -> int:
+    """
+    Per-process memoized `queryset.count()`, invalidated whenever the version
+    of the queryset's model changes. (Changes to other models used in filters
+    are not tracked). Only the most recently used COUNT_CACHE_SIZE counts are
+    kept.
+    """
+    sql, params = queryset.query.sql_with_params()
+    key = (queryset.db, sql, params)
+    version = get_version(queryset.model)
+    with _counts_lock:
+        memo = _counts.get(key)
+        if memo is not None and memo[0] == version:
+            _counts.move_to_end(key)
+            return memo[1]
+    count = queryset.count()
+    with _counts_lock:
+        _counts[key] = (version, count)
+        _counts.move_to_end(key)
+        while len(_counts) > COUNT_CACHE_SIZE:
+            _counts.popitem(last=False)
+    return count
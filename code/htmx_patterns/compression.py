@@ -0,0 +1,205 @@
+"""
+Compression of dynamic responses and static files.
+
+htmx fragments are often tiny (a single table row, a field with its errors), and
+for those the compression overhead (CPU time, plus gzip/brotli framing bytes)
+can outweigh any benefit, so we only compress responses above a size threshold.
+
+Settings (all optional):
+
+- ``COMPRESSION_MIN_SIZE`` - responses smaller than this many bytes are sent as-is.
+- ``COMPRESSION_GZIP_LEVEL`` - gzip level used for dynamic responses.
+- ``COMPRESSION_BROTLI_QUALITY`` - brotli quality used for dynamic responses.
+
+Brotli is used when the ``brotli`` package is installed and the client accepts
+it, otherwise we fall back to gzip.
+
+Static files are compressed ahead of time, at maximum level, into ``.gz`` and
+``.br`` siblings, which can be served directly by a front end web server
+(e.g. nginx ``gzip_static``).
+"""
+
+import gzip
+import os
+import re
+
+from compressor.storage import CompressorFileStorage
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 5
+
+# For static files, we only pay the cost once, at build time:
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+
+# Static files worth compressing. Images, fonts etc. are already compressed.
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".map", ".svg", ".html", ".txt", ".json", ".xml"}
+
+# Suffixes for precompressed files, in order of preference
+ENCODING_SUFFIXES = {
+    "br": ".br",
+    "gzip": ".gz",
+}
+
+_accept_encoding_re = re.compile(r"\b(gzip|br)\b")
+
+
+def available_encodings() -> list[str]:
+    """
+    Returns the content encodings we can produce, most preferred first.
+    """
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def compress_bytes(data: bytes, encoding: str, *, level: int | None = None) -> bytes:
+    """
+    Compress `data` using the given content encoding ("gzip" or "br")
+    """
+    if encoding == "gzip":
+        # mtime=0 gives deterministic output, which is better for ETags
+        return gzip.compress(data, compresslevel=DEFAULT_GZIP_LEVEL if level is None else level, mtime=0)
+    elif encoding == "br":
+        if brotli is None:
+            raise ValueError("brotli compression requires the 'brotli' package")
+        return brotli.compress(data, quality=DEFAULT_BROTLI_QUALITY if level is None else level)
+    raise ValueError(f"Unknown encoding {encoding!r}")
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """
+    Given an Accept-Encoding header, return the best encoding we can use, or None
+    """
+    accepted = set(_accept_encoding_re.findall(accept_encoding))
+    return next((encoding for encoding in available_encodings() if encoding in accepted), None)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses using brotli or gzip, skipping small responses.
+
+    This should be placed near the top of MIDDLEWARE, so that it sees the final
+    response body, but after SecurityMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, "COMPRESSION_MIN_SIZE", DEFAULT_MIN_SIZE)
+        self.levels = {
+            "gzip": getattr(settings, "COMPRESSION_GZIP_LEVEL", DEFAULT_GZIP_LEVEL),
+            "br": getattr(settings, "COMPRESSION_BROTLI_QUALITY", DEFAULT_BROTLI_QUALITY),
+        }
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        # Streaming responses (e.g. static files) are left alone, they should be
+        # served from precompressed files if needed.
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+
+        # Below the threshold, compression costs more than it saves.
+        if len(response.content) < self.min_size:
+            return response
+
+        # From here on, the response depends on Accept-Encoding, whether or not
+        # we compress this particular one.
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        compressed_content = compress_bytes(response.content, encoding, level=self.levels[encoding])
+        # Return the compressed content only if it's actually shorter.
+        if len(compressed_content) >= len(response.content):
+            return response
+
+        response.content = compressed_content
+        response["Content-Length"] = str(len(response.content))
+
+        # If there is a strong ETag, make it weak to fulfill the requirements
+        # of RFC 9110 Section 8.8.1 while also allowing conditional request
+        # matches on ETags.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = encoding
+        return response
+
+
+def precompress_file(path: str) -> list[str]:
+    """
+    Writes compressed siblings (e.g. `foo.css.gz`, `foo.css.br`) for the file
+    at `path`, where that is worthwhile. Returns list of files written.
+    """
+    if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+        return []
+    with open(path, "rb") as f:
+        data = f.read()
+    stat = os.stat(path)
+    written = []
+    for encoding in available_encodings():
+        compressed_path = path + ENCODING_SUFFIXES[encoding]
+        level = STATIC_BROTLI_QUALITY if encoding == "br" else STATIC_GZIP_LEVEL
+        compressed = compress_bytes(data, encoding, level=level)
+        if len(compressed) >= len(data):
+            # Remove stale versions from previous builds
+            if os.path.exists(compressed_path):
+                os.remove(compressed_path)
+            continue
+        with open(compressed_path, "wb") as f:
+            f.write(compressed)
+        # Matching mtimes allow servers to check that the sibling is current.
+        os.utime(compressed_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        written.append(compressed_path)
+    return written
+
+
+class PrecompressMixin:
+    """
+    Mixin for static files storage classes, that adds precompressed siblings
+    to the output of `collectstatic`.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        if hasattr(super(), "post_process"):
+            # Parent classes (e.g. ManifestStaticFilesStorage) may process files
+            # in multiple passes. We want to compress only the final versions.
+            results = list(super().post_process(paths, dry_run=dry_run, **options))
+        else:
+            results = [(name, name, False) for name in paths]
+
+        if not dry_run:
+            final_names = {
+                hashed_name or name for name, hashed_name, processed in results if not isinstance(processed, Exception)
+            }
+            for name in sorted(final_names):
+                precompress_file(self.path(name))
+
+        yield from results
+
+
+class PrecompressedCompressorFileStorage(CompressorFileStorage):
+    """
+    Storage for django-compressor output, that writes `.gz`/`.br` siblings
+    when compressing offline (`./manage.py build_assets`)
+    """
+
+    def save(self, filename, content):
+        filename = super().save(filename, content)
+        # In online mode, this is called in the request thread, and maximum
+        # compression of a large bundle can take most of a second.
+        if settings.COMPRESS_OFFLINE:
+            precompress_file(self.path(filename))
+        return filename
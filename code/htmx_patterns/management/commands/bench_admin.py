@@ -0,0 +1,106 @@
+import time
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from htmx_patterns.admin import MonsterAdmin
+from htmx_patterns.models import Monster
+
+
+class NaiveMonsterAdmin(admin.ModelAdmin):
+    list_display = ["name", "is_happy", "type", "date_of_birth"]
+    list_filter = ["is_happy", "type"]
+    search_fields = ["name"]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the Monster admin change list and bulk actions, comparing a default ModelAdmin with MonsterAdmin. "
+        "Use with a large table, see `seed_monsters`"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=3, help="Number of times to load each page")
+        parser.add_argument("--action-rows", type=int, default=2000, help="Number of monsters to kick/hug")
+
+    def handle(self, *args, repeat, action_rows, **options):
+        self.factory = RequestFactory()
+        self.user = User(username="bench", is_active=True, is_staff=True, is_superuser=True)
+        admins = [
+            ("default", NaiveMonsterAdmin(Monster, admin.site)),
+            ("MonsterAdmin", MonsterAdmin(Monster, admin.site)),
+        ]
+        self.stdout.write(f"Monsters: {Monster.objects.count()}\n")
+
+        scenarios = [
+            ("first page", {}),
+            ("page 100", {"p": "100"}),
+            ("search", {"q": "Ann"}),
+            ("filter: is_happy", {"is_happy__exact": "0"}),
+            ("filter: type", {"type__exact": "blob"}),
+        ]
+        self.stdout.write(f"{'change list':<20} {'admin':<20} {'queries':>7} {'db ms':>9} {'total ms':>9}")
+        for label, params in scenarios:
+            for admin_label, model_admin in admins:
+                queries, db_time, elapsed = self.time_change_list(model_admin, params, repeat)
+                self.stdout.write(
+                    f"{label:<20} {admin_label:<20} {queries:>7} {db_time * 1000:>9.1f} {elapsed * 1000:>9.1f}"
+                )
+
+        self.stdout.write(f"\n{'bulk action':<20} {'method':<20} {'queries':>7} {'':>9} {'total ms':>9}")
+        ids = list(Monster.objects.order_by("-id").values_list("id", flat=True)[:action_rows])
+        for label, method in [("save() per monster", self.kick_each), ("MonsterAdmin.kick", self.kick_admin)]:
+            queries, elapsed = self.time_action(method, ids)
+            self.stdout.write(f"{f'kick {len(ids)}':<20} {label:<20} {queries:>7} {'':>9} {elapsed * 1000:>9.1f}")
+
+        self.stdout.write(
+            "\nQueries are for one page load (excluding session and auth), after a first load to warm up caches, "
+            "so MonsterAdmin's memoized filtered counts don't appear. Bulk actions are rolled back after timing."
+        )
+
+    def time_change_list(self, model_admin, params, repeat):
+        total = db_total = 0
+        for i in range(repeat + 1):
+            request = self.factory.get("/admin/htmx_patterns/monster/", params)
+            request.user = self.user
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                model_admin.changelist_view(request).render()
+                elapsed = time.perf_counter() - start
+            if i > 0:
+                # The first load warms up templates and caches
+                total += elapsed
+                db_total += sum(float(query["time"]) for query in ctx.captured_queries)
+        return len(ctx.captured_queries), db_total / repeat, total / repeat
+
+    def time_action(self, method, ids):
+        try:
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as ctx:
+                    start = time.perf_counter()
+                    method(Monster.objects.filter(id__in=ids))
+                    elapsed = time.perf_counter() - start
+                raise Rollback()
+        except Rollback:
+            pass
+        return len(ctx.captured_queries), elapsed
+
+    def kick_each(self, queryset):
+        for monster in queryset:
+            monster.kick()
+
+    def kick_admin(self, queryset):
+        request = self.factory.post("/admin/htmx_patterns/monster/")
+        request.user = self.user
+        model_admin = MonsterAdmin(Monster, admin.site)
+        # Avoid needing the messages framework
+        model_admin.message_user = lambda *args, **kwargs: None
+        model_admin.kick(request, queryset)
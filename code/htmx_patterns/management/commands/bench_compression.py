@@ -0,0 +1,71 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from htmx_patterns.compression import available_encodings, compress_bytes
+
+LEVELS = {
+    "gzip": [1, 6, 9],
+    "br": [1, 5, 11],
+}
+
+
+class Command(BaseCommand):
+    help = "Measure CPU time and bytes saved by compressing typical full page and htmx fragment responses"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=200, help="Number of times to compress each response")
+
+    def handle(self, *args, repeat, **options):
+        samples = self.get_samples()
+        encodings = available_encodings()
+        self.stdout.write(f"Encodings available: {', '.join(encodings)}\n")
+        self.stdout.write(
+            f"{'response':<40} {'encoding':>10} {'bytes':>8} {'compressed':>10} {'saved':>7} {'µs/op':>8}"
+        )
+        for label, content in samples:
+            self.stdout.write(f"{label:<40} {'-':>10} {len(content):>8}")
+            for encoding in encodings:
+                for level in LEVELS[encoding]:
+                    start = time.perf_counter()
+                    for i in range(repeat):
+                        compressed = compress_bytes(content, encoding, level=level)
+                    elapsed = (time.perf_counter() - start) / repeat
+                    saved = len(content) - len(compressed)
+                    self.stdout.write(
+                        f"{'':<40} {f'{encoding}:{level}':>10} {'':>8} {len(compressed):>10} {saved:>7} {elapsed * 1e6:>8.1f}"
+                    )
+        self.stdout.write(
+            "\nResponses where 'saved' is small or negative are not worth compressing, "
+            "see COMPRESSION_MIN_SIZE setting."
+        )
+
+    def get_samples(self):
+        client = Client()
+        htmx = {"HTTP_HX_REQUEST": "true"}
+        requests = [
+            ("full page: modals_main", reverse("modals_main"), {}, {}),
+            ("full page: view_restart", reverse("view_restart"), {}, {}),
+            ("full page: toggle_with_separate_partials", reverse("toggle_with_separate_partials"), {}, {}),
+            (
+                "fragment: paging, next page",
+                reverse("paging_with_inline_partials_improved_lob"),
+                {"page": "2", "use_block": "page-and-paging-controls"},
+                htmx,
+            ),
+            (
+                "fragment: form field validation",
+                reverse("form_validation"),
+                {"_validate_field": "name", "name": "Mr Blobby"},
+                htmx,
+            ),
+            ("fragment: headers_demo", reverse("headers_demo"), {}, htmx | {"HTTP_HX_CURRENT_URL": "/headers/"}),
+        ]
+        samples = []
+        for label, url, params, headers in requests:
+            # No Accept-Encoding, so that we get uncompressed content
+            response = client.get(url, params, **headers)
+            samples.append((label, response.content))
+        return samples
@@ -0,0 +1,86 @@
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.contrib.staticfiles.views import serve
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, RequestFactory, override_settings
+from django.urls import reverse
+
+ACCEPT_ENCODING = {"HTTP_ACCEPT_ENCODING": "gzip, deflate, br"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate a browser with a cache making first and repeat page loads, and count requests and bytes, "
+        "comparing the Django development static file server with hashed, immutable static files"
+    )
+
+    def handle(self, *args, **options):
+        if not staticfiles_storage.exists(getattr(staticfiles_storage, "manifest_name", "staticfiles.json")):
+            raise CommandError("Static files manifest not found, run `./manage.py build_assets` first")
+
+        pages = [reverse("modals_main"), reverse("form_validation"), reverse("view_restart")]
+        self.stdout.write(f"{'page':<25} {'static files':<20} {'first load':>22} {'repeat load':>22}")
+        for page in pages:
+            for label, load_page in [
+                ("dev server, unhashed", self.load_page_dev_server),
+                ("hashed, immutable", self.load_page_immutable),
+            ]:
+                browser_cache = {}
+                first = load_page(page, browser_cache)
+                repeat = load_page(page, browser_cache)
+                self.stdout.write(
+                    f"{page:<25} {label:<20} "
+                    + " ".join(f"{requests:>5} reqs {size:>8} bytes" for requests, size in [first, repeat])
+                )
+
+        self.stdout.write(
+            "\nRequest counts include the page itself (bytes uncompressed). External (CDN) assets are not included. "
+            "Repeat loads assume the browser cache is still within max-age."
+        )
+
+    def load_page_dev_server(self, page, browser_cache):
+        # Unhashed names and no Cache-Control, as served by `runserver`
+        # (or a static server with default settings). The offline compression
+        # manifest only has hashed URLs, so compress online.
+        factory = RequestFactory()
+        with override_settings(DEBUG=True, COMPRESS_OFFLINE=False):
+            html = Client().get(page).content
+
+            def fetch(url, headers):
+                return serve(factory.get(url, **headers), url[len(settings.STATIC_URL) :], insecure=True)
+
+            return self.load_page(html, fetch, browser_cache)
+
+    def load_page_immutable(self, page, browser_cache):
+        with override_settings(DEBUG=False):
+            client = Client()
+            html = client.get(page).content
+            return self.load_page(html, lambda url, headers: client.get(url, **headers), browser_cache)
+
+    def load_page(self, html, fetch, browser_cache):
+        requests = 1
+        size = len(html)
+        for url in re.findall(rf'(?:src|href)="({re.escape(settings.STATIC_URL)}[^"]+)"', html.decode("utf-8")):
+            cached = browser_cache.get(url)
+            if cached is not None and cached["fresh"]:
+                continue
+            headers = dict(ACCEPT_ENCODING)
+            if cached is not None:
+                # Revalidate
+                if cached["etag"]:
+                    headers["HTTP_IF_NONE_MATCH"] = cached["etag"]
+                if cached["last_modified"]:
+                    headers["HTTP_IF_MODIFIED_SINCE"] = cached["last_modified"]
+            response = fetch(url, headers)
+            requests += 1
+            content = b"".join(response.streaming_content) if response.streaming else response.content
+            size += len(content)
+            if response.status_code == 200:
+                browser_cache[url] = {
+                    "etag": response.get("ETag"),
+                    "last_modified": response.get("Last-Modified"),
+                    "fresh": "max-age" in response.get("Cache-Control", ""),
+                }
+        return requests, size
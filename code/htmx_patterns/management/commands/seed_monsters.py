@@ -0,0 +1,123 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from faker import Faker
+
+from htmx_patterns.cache_versions import bump_version
+from htmx_patterns.models import Monster, MonsterType
+
+NAME_POOL_SIZE = 2000
+MAX_AGE_DAYS = 365 * 15
+GRUMPY_AGE_DAYS = 365 * 10
+# Dates of birth are relative to this, rather than the current date, so that
+# the same seed gives the same data whenever the command is run.
+DEFAULT_TODAY = date(2024, 1, 1)
+# Dropping and recreating indexes only pays off if we add at least this many
+# rows per existing row, otherwise rebuilding the indexes for the rows already
+# there costs more than it saves.
+REBUILD_INDEXES_MIN_RATIO = 1.0
+
+
+class Command(BaseCommand):
+    help = "Quickly create a large number of random monsters, e.g. for load testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("count", type=int, help="Number of monsters to create")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, for reproducible data")
+        parser.add_argument(
+            "--today",
+            type=date.fromisoformat,
+            default=DEFAULT_TODAY,
+            help=f"Date that ages are relative to, YYYY-MM-DD (default {DEFAULT_TODAY.isoformat()})",
+        )
+        parser.add_argument("--batch-size", type=int, default=50_000, help="Rows per INSERT batch/transaction")
+        parser.add_argument(
+            "--keep-indexes",
+            action="store_true",
+            help=(
+                "Don't drop and recreate indexes around the load (slower for large counts). "
+                "Indexes are always kept if the table is already large compared to `count`"
+            ),
+        )
+
+    def handle(self, *args, count, seed, today, batch_size, keep_indexes, verbosity, **options):
+        rng = random.Random(seed)
+        # Faker is slow per call, so we use it only to build a pool of names.
+        faker = Faker()
+        faker.seed_instance(seed)
+        names = [faker.first_name() for i in range(NAME_POOL_SIZE)]
+        types = MonsterType.values
+        today = today.toordinal()
+
+        table = connection.ops.quote_name(Monster._meta.db_table)
+        columns = ", ".join(
+            connection.ops.quote_name(Monster._meta.get_field(f).column)
+            for f in ["name", "is_happy", "date_of_birth", "type"]
+        )
+        sql = f"INSERT INTO {table} ({columns}) VALUES (%s, %s, %s, %s)"
+
+        start = time.perf_counter()
+        indexes = []
+        if not keep_indexes and count >= Monster.objects.count() * REBUILD_INDEXES_MIN_RATIO:
+            indexes = Monster._meta.indexes
+        with _fast_sqlite_writes():
+            with connection.schema_editor() as schema_editor:
+                for index in indexes:
+                    schema_editor.remove_index(Monster, index)
+
+            created = 0
+            try:
+                while created < count:
+                    size = min(batch_size, count - created)
+                    ages = [rng.randrange(MAX_AGE_DAYS) for i in range(size)]
+                    rows = zip(
+                        rng.choices(names, k=size),
+                        # Monsters more than 10 years old are grumpy, see Monster.clean()
+                        [age <= GRUMPY_AGE_DAYS and rng.random() < 0.5 for age in ages],
+                        [date.fromordinal(today - age) for age in ages],
+                        rng.choices(types, k=size),
+                    )
+                    with transaction.atomic():
+                        with connection.cursor() as cursor:
+                            cursor.executemany(sql, list(rows))
+                    created += size
+                    if verbosity > 1:
+                        self.stdout.write(f"{created} rows, {created / (time.perf_counter() - start):.0f} rows/s")
+            finally:
+                # Even if the load fails or is interrupted, so that the schema
+                # matches the migration state.
+                if indexes:
+                    self.stdout.write("Recreating indexes")
+                with connection.schema_editor() as schema_editor:
+                    for index in indexes:
+                        schema_editor.add_index(Monster, index)
+                # Raw SQL doesn't send signals. Completed batches are committed.
+                if created:
+                    bump_version(Monster)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"Created {count} monsters in {elapsed:.1f}s ({count / elapsed:.0f} rows/s)")
+
+
+@contextmanager
+def _fast_sqlite_writes():
+    """
+    Relaxes SQLite durability for the duration of a bulk load. The data is
+    still consistent if we crash, but may be incomplete.
+    """
+    if connection.vendor != "sqlite":
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        old_synchronous = cursor.fetchone()[0]
+        cursor.execute("PRAGMA synchronous = OFF")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA synchronous = {int(old_synchronous)}")
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:04
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("htmx_patterns", "0004_monster_date_of_birth_monster_type"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="monster",
+            index=models.Index(
+                django.db.models.functions.comparison.Collate("name", "NOCASE"), name="monster_name_nocase_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="monster",
+            index=models.Index(condition=models.Q(("is_happy", True)), fields=["id"], name="monster_happy_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="monster",
+            index=models.Index(condition=models.Q(("is_happy", False)), fields=["id"], name="monster_unhappy_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="monster",
+            index=models.Index(fields=["type", "id"], name="monster_type_id_idx"),
+        ),
+    ]
@@ -5,6 +5,7 @@ from boltons.iterutils import flatten
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models.enums import TextChoices
+from django.db.models.functions import Collate
 from faker import Faker
 
 
@@ -37,6 +38,19 @@ class Monster(models.Model):
         help_text="Don't complain about the lack of choices",
     )
 
+    class Meta:
+        indexes = [
+            # Prefix search on name in the admin. NOCASE allows SQLite to use
+            # this index for `LIKE 'foo%'`, which is case insensitive.
+            models.Index(Collate("name", "NOCASE"), name="monster_name_nocase_idx"),
+            # Filtering in the admin, with ordering by id within the filter.
+            # SQLite filters booleans with `WHERE "is_happy"`/`WHERE NOT
+            # "is_happy"`, which can use only partial indexes like these.
+            models.Index(fields=["id"], condition=models.Q(is_happy=True), name="monster_happy_id_idx"),
+            models.Index(fields=["id"], condition=models.Q(is_happy=False), name="monster_unhappy_id_idx"),
+            models.Index(fields=["type", "id"], name="monster_type_id_idx"),
+        ]
+
     def toggle_happiness(self):
         self.is_happy = not self.is_happy
         self.save()
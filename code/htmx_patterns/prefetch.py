@@ -0,0 +1,134 @@
+import copy
+import hashlib
+import logging
+
+from django.core.cache import cache
+from django.http.request import HttpRequest
+from django.http.response import HttpResponse
+from django.utils.functional import wraps
+
+from .cache_versions import get_versions
+from .utils import is_htmx
+
+logger = logging.getLogger(__name__)
+
+# GET parameter that marks a request as a speculative prefetch.
+PREFETCH_PARAM = "_prefetch"
+
+PREFETCH_STATS_KEYS = ("hits", "misses", "primed")
+
+
+def prefetch_cached(*, timeout: int = 30, depends_on=()):
+    """
+    Adds server-side support for speculative prefetch of htmx fragments,
+    e.g. the next page in "Load more" style paging.
+
+    A htmx GET request that includes the `_prefetch` parameter is rendered
+    normally, but instead of being returned, the content is stored in the cache
+    for `timeout` seconds, keyed by path and the other GET params. When the
+    same request (without `_prefetch`) comes in, typically when the user
+    clicks, the stored fragment is returned immediately, without queries or
+    template rendering.
+
+    The template triggers the prefetch with something like:
+
+        <span hx-get="?page=2&_prefetch=1" hx-trigger="load" hx-swap="none"></span>
+
+    `depends_on` is a list of models (or cache version tags) that the content
+    depends on. When any of them change, previously prefetched content is not used.
+
+    Apply this outside of `for_htmx`, so that it sees the final response.
+
+    Only use this for content that doesn't vary by user. For multiple worker
+    processes, the cache needs to be shared between them (not LocMemCache).
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def _view(request, *args, **kwargs):
+            if not is_htmx(request) or request.method != "GET":
+                return view(request, *args, **kwargs)
+
+            cache_key = _get_cache_key(request, get_versions(depends_on))
+            if PREFETCH_PARAM in request.GET:
+                resp = view(_strip_prefetch_param(request), *args, **kwargs)
+                if hasattr(resp, "render"):
+                    resp.render()
+                if resp.status_code == 200 and not resp.streaming:
+                    cache.set(cache_key, resp.content, timeout)
+                    _incr_stat("primed")
+                return HttpResponse(status=204)
+
+            content = cache.get(cache_key)
+            if content is not None:
+                # Single use, so that following requests get fresh data.
+                cache.delete(cache_key)
+                _incr_stat("hits")
+                resp = HttpResponse(content=content)
+            else:
+                _incr_stat("misses")
+                resp = view(request, *args, **kwargs)
+            if logger.isEnabledFor(logging.DEBUG):
+                # Costs a few cache reads, so only when wanted
+                _log_stats()
+            return resp
+
+        return _view
+
+    return decorator
+
+
+def get_prefetch_stats() -> dict:
+    """
+    Returns hit/miss counts for prefetched fragments, and derived values:
+
+    - hit_rate: proportion of fragment requests served from prefetch.
+    - wasted: number of prefetches that were never used.
+    """
+    stats = {key: cache.get(_stats_key(key), 0) for key in PREFETCH_STATS_KEYS}
+    requests = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / requests if requests else 0.0
+    stats["wasted"] = max(stats["primed"] - stats["hits"], 0)
+    return stats
+
+
+def reset_prefetch_stats():
+    cache.delete_many([_stats_key(key) for key in PREFETCH_STATS_KEYS])
+
+
+def _get_cache_key(request: HttpRequest, versions: tuple[int, ...]) -> str:
+    # Hashed, because cache backends such as memcached don't allow spaces or
+    # control characters in keys, and limit their length.
+    params = sorted((key, values) for key, values in request.GET.lists() if key != PREFETCH_PARAM)
+    digest = hashlib.md5(repr((request.path, versions, params)).encode("utf-8"), usedforsecurity=False).hexdigest()
+    return f"prefetch:{digest}"
+
+
+def _strip_prefetch_param(request: HttpRequest) -> HttpRequest:
+    new_request = copy.copy(request)
+    new_request.GET = request.GET.copy()
+    del new_request.GET[PREFETCH_PARAM]
+    return new_request
+
+
+def _stats_key(name: str) -> str:
+    return f"prefetch-stats:{name}"
+
+
+def _incr_stat(name: str):
+    key = _stats_key(name)
+    # `add` is a no-op if the key exists, and avoids a race with `incr`.
+    cache.add(key, 0, timeout=None)
+    cache.incr(key)
+
+
+def _log_stats():
+    stats = get_prefetch_stats()
+    logger.debug(
+        "Prefetch hit rate %.0f%% (%d hits, %d misses, %d primed, %d wasted)",
+        stats["hit_rate"] * 100,
+        stats["hits"],
+        stats["misses"],
+        stats["primed"],
+        stats["wasted"],
+    )
@@ -27,7 +27,7 @@ if SECRET_KEY is None:
     SECRET_KEY = "anything"
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.getenv("DEBUG", "1") != "0"
 
 ALLOWED_HOSTS = ["*"]
 X_FRAME_OPTIONS = "*"
@@ -51,8 +51,18 @@ INSTALLED_APPS = [
     "htmx_patterns",
 ]
 
+# Note that session, auth and messages middleware, and the matching context
+# processors below, are all lazy: the session is loaded from the database only
+# when `request.session`, `request.user` or the message storage is actually
+# used. So htmx fragments that don't use `user` or `messages` (e.g. a single
+# form field validation, or a block that doesn't include the message list)
+# already do no session queries, and no per-view opt-out is needed. This is
+# checked by FragmentQueryTests in htmx_patterns/tests.py.
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "htmx_patterns.static.StaticFilesMiddleware",
+    "htmx_patterns.compression.CompressionMiddleware",
+    "htmx_patterns.template_profiling.TemplateProfilerMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -93,6 +103,9 @@ DATABASES = {
     }
 }
 
+# Shared by all worker processes, see htmx_patterns/cache_versions.py
+CACHE_VERSIONS_DB = BASE_DIR / "cache_versions.sqlite3"
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -138,6 +151,58 @@ STATICFILES_FINDERS = (
     "compressor.finders.CompressorFinder",
 )
 STATIC_ROOT = BASE_DIR / "_static"
+# With DEBUG off, files in STATIC_ROOT are served with hashed names and
+# far-future caching headers, see htmx_patterns/static.py
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "htmx_patterns.static.HashedStaticFilesStorage",
+    },
+}
 
 COMPRESS_ENABLED = True
 COMPRESS_PRECOMPILERS = [("text/x-scss", "django_libsass.SassCompiler")]
+# For deployment, run `./manage.py build_assets` at build time and set
+# COMPRESS_OFFLINE=1, so that {% compress %} becomes a lookup in the manifest
+# written by the build, and SCSS is never compiled in the request thread.
+COMPRESS_OFFLINE = os.getenv("COMPRESS_OFFLINE", "") == "1"
+COMPRESS_STORAGE = "htmx_patterns.compression.PrecompressedCompressorFileStorage"
+
+# See htmx_patterns/compression.py
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+
+# Write coalescing for monster happiness changes, see htmx_patterns/write_behind.py
+# "sync": write each change immediately. "delayed": merge changes and write
+# them in one transaction, within WRITE_BEHIND_DELAY seconds.
+WRITE_BEHIND_MODE = os.getenv("WRITE_BEHIND_MODE", "sync")
+WRITE_BEHIND_DELAY = 0.5
+
+# Template profiling, see htmx_patterns/template_profiling.py
+TEMPLATE_PROFILING = os.getenv("TEMPLATE_PROFILING", "") == "1"
+TEMPLATE_PROFILE_DIR = BASE_DIR / "_template_profiles"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+        },
+    },
+    "loggers": {
+        # Prefetch hit rate, see htmx_patterns/prefetch.py
+        "htmx_patterns.prefetch": {
+            "handlers": ["console"],
+            "level": "DEBUG" if DEBUG else "INFO",
+        },
+        "htmx_patterns.template_profiling": {
+            "handlers": ["console"],
+            "level": "INFO",
+        },
+    },
+}
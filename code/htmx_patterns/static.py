@@ -0,0 +1,198 @@
+"""
+Static files with content hashes in their names, served in-process with
+far-future caching headers, so that no separate static file server is needed.
+
+- `HashedStaticFilesStorage` gives every collected file a content hash in its
+  name (e.g. `js/htmx-1.9.4.0a1b2c3d4e5f.js`), and `.gz`/`.br` siblings.
+- `StaticFilesMiddleware` serves files from STATIC_ROOT. Files with a hash in
+  their name (including django-compressor output) are sent with an `immutable`
+  Cache-Control header, so browsers never need to revalidate them. It uses
+  precompressed siblings where the client accepts them, precomputed ETags and
+  supports single range requests.
+
+The file index is built when the middleware is loaded, i.e. once per worker
+process, so workers need restarting after `collectstatic`, like any deploy.
+Files that appear later (e.g. django-compressor output in online mode) are
+picked up on first request.
+"""
+
+import mimetypes
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags
+
+from .compression import ENCODING_SUFFIXES, PrecompressMixin, choose_encoding
+
+# ManifestStaticFilesStorage and django-compressor both use 12 hex digits
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{12}\.[^/]+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=60"
+
+_range_re = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class HashedStaticFilesStorage(PrecompressMixin, ManifestStaticFilesStorage):
+    # Files missing from the manifest are hashed from STATIC_ROOT if there,
+    # instead of raising an error.
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Not collected, e.g. in tests, which always run with DEBUG off,
+            # or before `collectstatic` has been run. Link to the unhashed
+            # name, like with DEBUG on, rather than failing every page.
+            return name
+
+
+@dataclass
+class StaticFile:
+    path: str
+    size: int
+    etag: str
+    last_modified: str
+    content_type: str
+
+
+def _stat_file(path: str, content_type: str) -> StaticFile | None:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return StaticFile(
+        path=path,
+        size=stat.st_size,
+        etag=f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"',
+        last_modified=http_date(stat.st_mtime),
+        content_type=content_type,
+    )
+
+
+class StaticFilesMiddleware:
+    """
+    Serves files in STATIC_ROOT under STATIC_URL. Place this near the top of
+    MIDDLEWARE, so that static file requests skip other middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        static_url = settings.STATIC_URL
+        if not static_url or "://" in static_url:
+            # Served from elsewhere
+            raise MiddlewareNotUsed()
+        self.prefix = "/" + static_url.lstrip("/")
+        self.root = Path(settings.STATIC_ROOT)
+        # name -> {encoding or None: StaticFile}
+        self.files: dict[str, dict[str | None, StaticFile]] = {}
+        if self.root.exists():
+            for dirpath, dirnames, filenames in os.walk(self.root):
+                for filename in filenames:
+                    if any(filename.endswith(suffix) for suffix in ENCODING_SUFFIXES.values()):
+                        continue
+                    name = os.path.relpath(os.path.join(dirpath, filename), self.root).replace(os.sep, "/")
+                    self.find_file(name)
+
+    def __call__(self, request):
+        if request.path_info.startswith(self.prefix) and request.method in ("GET", "HEAD"):
+            name = request.path_info[len(self.prefix) :]
+            variants = self.find_file(name)
+            if variants is not None:
+                return self.serve(request, name, variants)
+        return self.get_response(request)
+
+    def find_file(self, name: str) -> dict[str | None, StaticFile] | None:
+        try:
+            return self.files[name]
+        except KeyError:
+            pass
+        try:
+            path = safe_join(self.root, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+        # For compressed variants, the content type is that of the original file
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        variants = {None: _stat_file(path, content_type)}
+        for encoding, suffix in ENCODING_SUFFIXES.items():
+            if (compressed := _stat_file(path + suffix, content_type)) is not None:
+                variants[encoding] = compressed
+        self.files[name] = variants
+        return variants
+
+    def serve(self, request, name: str, variants: dict[str | None, StaticFile]):
+        range_header = request.headers.get("Range")
+        if range_header and request.headers.get("If-Range", variants[None].etag) != variants[None].etag:
+            range_header = None
+
+        # Ranges refer to the unencoded content
+        encoding = None
+        if not range_header:
+            encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+            if encoding not in variants:
+                encoding = None
+        static_file = variants[encoding]
+
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if static_file.etag in if_none_match or "*" in if_none_match:
+            response = HttpResponseNotModified()
+        elif range_header:
+            response = self.serve_range(static_file, range_header)
+        else:
+            response = self.file_response(static_file)
+
+        response["ETag"] = static_file.etag
+        response["Last-Modified"] = static_file.last_modified
+        response["Cache-Control"] = IMMUTABLE_CACHE_CONTROL if HASHED_NAME_RE.search(name) else DEFAULT_CACHE_CONTROL
+        response["Accept-Ranges"] = "bytes"
+        if len(variants) > 1:
+            patch_vary_headers(response, ("Accept-Encoding",))
+        if encoding is not None:
+            response["Content-Encoding"] = encoding
+        return response
+
+    def file_response(self, static_file: StaticFile):
+        response = FileResponse(open(static_file.path, "rb"), content_type=static_file.content_type)
+        # FileResponse adds this with the name of the file on disk, which is
+        # wrong for .gz/.br variants, and not needed for static assets.
+        del response["Content-Disposition"]
+        return response
+
+    def serve_range(self, static_file: StaticFile, range_header: str):
+        # Only single ranges are supported. For others, send the whole file,
+        # which RFC 9110 allows.
+        match = _range_re.match(range_header.strip())
+        if not match or match.groups() == ("", ""):
+            return self.file_response(static_file)
+
+        start, end = match.groups()
+        if start == "":
+            # Suffix range, e.g. "bytes=-500"
+            start = max(static_file.size - int(end), 0)
+            end = static_file.size - 1
+        else:
+            start = int(start)
+            end = min(int(end), static_file.size - 1) if end else static_file.size - 1
+
+        if start >= static_file.size or start > end:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{static_file.size}"
+            return response
+
+        with open(static_file.path, "rb") as f:
+            f.seek(start)
+            content = f.read(end - start + 1)
+        response = HttpResponse(content, status=206, content_type=static_file.content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{static_file.size}"
+        return response
@@ -14,4 +14,13 @@
         document.querySelector('dialog[open]').close();
     });
 
+    document.body.addEventListener('monsterCreated', function(event) {
+        // The new row is inserted by an out-of-band swap, after the previous
+        // row. If that row isn't on this page (e.g. it was added by someone
+        // else), the swap does nothing, so fetch the whole list instead.
+        if (!document.getElementById('monster-row-' + event.detail.value)) {
+            htmx.trigger(document.body, 'monsterListStale');
+        }
+    });
+
 })();
@@ -0,0 +1,13 @@
+(function () {
+    // For gaps in windowed lists, tell the server which row of the gap is at
+    // the top of the viewport, so that it can render the visible rows.
+    document.body.addEventListener("htmx:configRequest", function(evt) {
+        const gap = evt.detail.elt;
+        if (gap.dataset.windowGap === undefined) {
+            return;
+        }
+        const rowHeight = parseFloat(gap.dataset.rowHeight);
+        const visibleRow = Math.max(0, Math.floor(-gap.getBoundingClientRect().top / rowHeight));
+        evt.detail.parameters["visible_row"] = visibleRow;
+    });
+})();
@@ -0,0 +1,179 @@
+"""
+Opt-in profiler for Django template rendering.
+
+When enabled, this records the render time and call count of every template
+node (including nodes inside extends/block/include), for both full
+TemplateResponse rendering and blocks rendered with `render_block_to_string`,
+and writes the results for each request as a "collapsed stack" file that can be
+fed to flame graph tools (e.g. flamegraph.pl, speedscope, inferno).
+
+Enable by setting TEMPLATE_PROFILING = True (e.g. via the TEMPLATE_PROFILING=1
+environment variable, see settings). Output goes to TEMPLATE_PROFILE_DIR.
+
+When disabled, the middleware removes itself and template nodes are not
+patched, so there is no overhead at all.
+"""
+
+import contextvars
+import logging
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.template.base import Node, TextNode, TokenType
+
+logger = logging.getLogger(__name__)
+
+_active_profile: contextvars.ContextVar["TemplateProfile | None"] = contextvars.ContextVar(
+    "active_template_profile", default=None
+)
+
+_original_render_annotated = Node.render_annotated
+
+
+class TemplateProfile:
+    """
+    Records timings for a tree of rendered nodes.
+
+    `stats` maps a stack of node labels (a tuple) to [call count, total time, self time],
+    where times are in seconds, and self time excludes time spent in child nodes.
+    """
+
+    def __init__(self, root_label: str):
+        self.root_label = root_label
+        self.stats: dict[tuple[str, ...], list] = {}
+        self._stack: list[str] = [root_label]
+        self._child_times: list[float] = [0.0]
+
+    def enter(self, label: str):
+        self._stack.append(label)
+        self._child_times.append(0.0)
+
+    def exit(self, elapsed: float):
+        child_time = self._child_times.pop()
+        entry = self.stats.setdefault(tuple(self._stack), [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] += elapsed - child_time
+        self._stack.pop()
+        self._child_times[-1] += elapsed
+
+    def collapsed_stacks(self) -> list[str]:
+        """
+        Returns lines in "collapsed stack" format, with self time in microseconds as the value.
+        """
+        return [
+            f"{';'.join(stack)} {round(self_time * 1e6)}"
+            for stack, (count, total_time, self_time) in sorted(self.stats.items())
+        ]
+
+    def write_collapsed(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("".join(line + "\n" for line in self.collapsed_stacks()))
+
+    def summary(self, limit: int = 10) -> list[tuple[str, int, float]]:
+        """
+        Returns (node label, call count, total time) for the most expensive nodes,
+        aggregated over all places the node appears in the tree.
+        """
+        totals: dict[str, list] = {}
+        for stack, (count, total_time, self_time) in self.stats.items():
+            # Don't double count recursive appearances of the same node
+            if stack[-1] in stack[:-1]:
+                continue
+            entry = totals.setdefault(stack[-1], [0, 0.0])
+            entry[0] += count
+            entry[1] += total_time
+        return sorted(
+            ((label, count, total_time) for label, (count, total_time) in totals.items()),
+            key=lambda item: item[2],
+            reverse=True,
+        )[:limit]
+
+
+def _profiled_render_annotated(self, context):
+    profile = _active_profile.get()
+    if profile is None:
+        return _original_render_annotated(self, context)
+    profile.enter(_node_label(self))
+    start = time.perf_counter()
+    try:
+        return _original_render_annotated(self, context)
+    finally:
+        profile.exit(time.perf_counter() - start)
+
+
+def _node_label(node: Node) -> str:
+    token = getattr(node, "token", None)
+    if isinstance(node, TextNode) or token is None:
+        label = "text" if isinstance(node, TextNode) else type(node).__name__
+    else:
+        contents = " ".join(token.contents.split())[:60]
+        label = f"{{{{ {contents} }}}}" if token.token_type == TokenType.VAR else f"{{% {contents} %}}"
+    origin = getattr(node, "origin", None)
+    if origin is not None and token is not None:
+        label = f"{label} ({origin.template_name}:{token.lineno})"
+    # Semicolons are the stack separator in collapsed stack format
+    return label.replace(";", ",")
+
+
+def install():
+    """
+    Patch template nodes so that they can be profiled. Idempotent.
+    """
+    Node.render_annotated = _profiled_render_annotated
+
+
+def uninstall():
+    Node.render_annotated = _original_render_annotated
+
+
+@contextmanager
+def profile_templates(root_label: str = "render"):
+    """
+    Context manager that profiles all template rendering done inside it
+    (in the current thread/context), yielding the `TemplateProfile`.
+    """
+    was_installed = Node.render_annotated is _profiled_render_annotated
+    install()
+    profile = TemplateProfile(root_label)
+    token = _active_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _active_profile.reset(token)
+        if not was_installed:
+            uninstall()
+
+
+class TemplateProfilerMiddleware:
+    """
+    Profiles the template rendering for each request, if TEMPLATE_PROFILING is True,
+    writing a collapsed stack file per request into TEMPLATE_PROFILE_DIR.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "TEMPLATE_PROFILING", False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.output_dir = Path(settings.TEMPLATE_PROFILE_DIR)
+        install()
+
+    def __call__(self, request):
+        label = f"{request.method} {request.path}"
+        if request.headers.get("Hx-Request", False):
+            label += " (htmx)"
+        with profile_templates(root_label=label.replace(";", ",")) as profile:
+            response = self.get_response(request)
+
+        if profile.stats:
+            slug = re.sub(r"[^a-zA-Z0-9]+", "-", request.path).strip("-") or "root"
+            path = self.output_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{time.perf_counter_ns()}-{slug}.folded"
+            profile.write_collapsed(path)
+            logger.info("Template profile for %s written to %s", label, path)
+            for node_label, count, total_time in profile.summary():
+                logger.info("  %8.2fms %6d× %s", total_time * 1000, count, node_label)
+        return response
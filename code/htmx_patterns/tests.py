@@ -0,0 +1,114 @@
+import json
+import tempfile
+from collections import OrderedDict
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .cache_versions import count_cached
+from .models import Monster
+
+
+class FullPageTests(TestCase):
+    def test_render_without_collectstatic(self):
+        # Tests run with DEBUG off, which uses hashed static file names from
+        # the manifest written by `collectstatic`.
+        with tempfile.TemporaryDirectory() as static_root:
+            with override_settings(STATIC_ROOT=static_root):
+                response = self.client.get(reverse("modals_main"))
+        self.assertContains(response, 'src="/static/js/modals.js"')
+
+
+class FragmentQueryTests(TestCase):
+    # Session, auth and messages middleware are lazy, so fragments that don't
+    # use them do no queries, even for a logged in user. See MIDDLEWARE.
+    def setUp(self):
+        self.client.force_login(User.objects.create_user("monster_keeper"))
+
+    def test_validate_field(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse("form_validation"), {"_validate_field": "name", "name": "Bob"}, HTTP_HX_REQUEST="true"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'value="Bob"')
+
+    def test_headers_demo(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse("headers_demo"), HTTP_HX_REQUEST="true", HTTP_HX_CURRENT_URL="http://testserver/headers/"
+            )
+        self.assertContains(response, "from http://testserver/headers/")
+
+
+class CreateMonsterTests(TestCase):
+    def create_monster(self, name):
+        response = self.client.post(
+            reverse("modals_create_monster"), {"name": name, "is_happy": "on"}, HTTP_HX_REQUEST="true"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Hx-Reswap"], "none")
+        monster = Monster.objects.get(name=name)
+        # Used by modals.js to check the row was inserted
+        self.assertEqual(json.loads(response["Hx-Trigger-After-Swap"]), {"monsterCreated": monster.id})
+        return response, monster
+
+    def test_refetch_monster_list(self):
+        # The fallback for when the out-of-band swap has no target
+        Monster.objects.create(name="Anna")
+        response = self.client.get(reverse("modals_main"), {"use_block": "monster-list"}, HTTP_HX_REQUEST="true")
+        self.assertContains(response, 'hx-trigger="monsterListStale from:body"')
+        self.assertContains(response, "<td>Anna</td>", html=True)
+        self.assertNotContains(response, "<h1>")
+
+    def test_new_row_is_out_of_band_swap(self):
+        Monster.objects.all().delete()
+        previous = Monster.objects.create(name="Anna")
+        Monster.objects.create(name="Zak")
+        response, monster = self.create_monster("Bob")
+        # The row must be wrapped, because htmx inserts the children of the
+        # out-of-band element for `afterend` swaps.
+        self.assertInHTML(
+            f"""
+            <tbody hx-swap-oob="afterend:#monster-row-{previous.id}">
+              <tr id="monster-row-{monster.id}"><td>Bob</td><td>Yes</td></tr>
+            </tbody>
+            """,
+            response.content.decode("utf-8"),
+        )
+        self.assertNotContains(response, "monster-list-empty")
+
+    def test_first_monster(self):
+        Monster.objects.all().delete()
+        response, monster = self.create_monster("Bob")
+        content = response.content.decode("utf-8")
+        self.assertInHTML(
+            f"""
+            <tbody hx-swap-oob="afterend:#monster-list-header">
+              <tr id="monster-row-{monster.id}"><td>Bob</td><td>Yes</td></tr>
+            </tbody>
+            """,
+            content,
+        )
+        self.assertInHTML(
+            """
+            <tr id="monster-list-empty" hx-swap-oob="delete"><td colspan="2">There are no monsters</td></tr>
+            """,
+            content,
+        )
+
+
+class CountCachedTests(TestCase):
+    def test_counts_are_bounded(self):
+        with patch("htmx_patterns.cache_versions._counts", OrderedDict()) as counts:
+            with patch("htmx_patterns.cache_versions.COUNT_CACHE_SIZE", 2):
+                for name in ["Anna", "Bob", "Carl"]:
+                    self.assertEqual(count_cached(Monster.objects.filter(name=name)), 0)
+                self.assertEqual(len(counts), 2)
+                # Same SQL, different params, must not share a count
+                with self.captureOnCommitCallbacks(execute=True):
+                    Monster.objects.create(name="Bob")
+                self.assertEqual(count_cached(Monster.objects.filter(name="Bob")), 1)
+                self.assertEqual(count_cached(Monster.objects.filter(name="Carl")), 0)
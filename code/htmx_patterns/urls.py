@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.urls import path
 
 from . import views
-from .views import actions, forms, headers, modals, partials, posts, restarts
+from .views import actions, forms, headers, modals, partials, posts, restarts, windowed
 
 urlpatterns = [
     path("", views.home),
@@ -16,6 +16,7 @@ urlpatterns = [
         name="toggle_with_separate_partials",
     ),
     path("toggle-item/<int:monster_id>/", partials.toggle_item, name="toggle_item"),
+    path("windowed-list/", windowed.windowed_list, name="windowed_list"),
     path(
         "paging-with-separate-partials/",
         partials.paging_with_separate_partials,
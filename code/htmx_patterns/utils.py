@@ -52,7 +52,7 @@ def for_htmx(
                 if if_hx_target is None or request.headers.get("Hx-Target", None) == if_hx_target:
                     blocks_to_use = use_block
                     if not hasattr(resp, "render"):
-                        if not resp.content and any(
+                        if any(
                             h in resp.headers
                             for h in (
                                 "Hx-Trigger",
@@ -61,7 +61,9 @@ def for_htmx(
                                 "Hx-Redirect",
                             )
                         ):
-                            # This is a special case response, it doesn't need modifying:
+                            # This is a special case response, it doesn't need modifying.
+                            # It may be empty, or may contain fragments
+                            # (e.g. out-of-band swaps) to go with the triggers.
                             return resp
 
                         raise ValueError("Cannot modify a response that isn't a TemplateResponse")
@@ -4,17 +4,18 @@ from django.shortcuts import get_object_or_404
 from django.template.response import TemplateResponse
 from htmx_patterns.models import Monster
 from htmx_patterns.utils import for_htmx, is_htmx
+from htmx_patterns.write_behind import apply_pending, set_happiness
 
 
 @for_htmx(use_block_from_params=True)
 def multiple_actions(request: HttpRequest, monster_id: int):
-    monster: Monster = get_object_or_404(Monster.objects.all(), id=monster_id)
+    monster: Monster = apply_pending(get_object_or_404(Monster.objects.all(), id=monster_id))
 
     if request.method == "POST":
         if "kick" in request.POST:
-            monster.kick()
+            set_happiness(monster, False)
         elif "hug" in request.POST:
-            monster.hug()
+            set_happiness(monster, True)
         if not is_htmx(request):
             return HttpResponseRedirect("")
 
@@ -1,12 +1,16 @@
 import json
 
+from django.db.models import Q
 from django.forms import ModelForm
 from django.http import HttpRequest, HttpResponse
 from django.template.response import TemplateResponse
+from render_block import render_block_to_string
 
 from ..models import Monster
 from ..utils import for_htmx
 
+MONSTER_LIST_ORDERING = ["name", "id"]
+
 
 @for_htmx(use_block_from_params=True)
 def main(request: HttpRequest):
@@ -14,7 +18,7 @@ def main(request: HttpRequest):
         request,
         "modals_main.html",
         {
-            "monsters": Monster.objects.all().order_by("name"),
+            "monsters": Monster.objects.all().order_by(*MONSTER_LIST_ORDERING),
         },
     )
 
@@ -32,15 +36,52 @@ def create_monster(request: HttpRequest):
         if form.is_valid():
             monster = form.save()
             return HttpResponse(
+                render_new_monster_row(request, monster),
                 headers={
-                    "Hx-Trigger": json.dumps(
-                        {
-                            "closeModal": True,
-                            "monsterCreated": monster.id,
-                        }
-                    )
-                }
+                    "Hx-Trigger": json.dumps({"closeModal": True}),
+                    # After the swap, so that modals.js can check the new row
+                    # was inserted, see below.
+                    "Hx-Trigger-After-Swap": json.dumps({"monsterCreated": monster.id}),
+                    # Only the out-of-band swaps are needed
+                    "Hx-Reswap": "none",
+                },
             )
     else:
         form = CreateMonsterForm()
     return TemplateResponse(request, "modals_create_monster.html", {"form": form})
+
+
+def render_new_monster_row(request: HttpRequest, monster: Monster) -> str:
+    """
+    Render the row for a newly created monster as an out-of-band swap, inserted
+    at the correct position in the list on the `main` page, so that the list
+    doesn't need to be fetched again.
+
+    If the previous monster was created by someone else after the page was
+    loaded, it isn't on the page, so there is nothing to insert after. In that
+    case, modals.js asks for the whole list again.
+    """
+    # Predecessor according to MONSTER_LIST_ORDERING
+    previous_monster = (
+        Monster.objects.filter(Q(name__lt=monster.name) | Q(name=monster.name, id__lt=monster.id))
+        .order_by(*[f"-{field}" for field in MONSTER_LIST_ORDERING])
+        .only("id")
+        .first()
+    )
+    if previous_monster is not None:
+        oob_swap = f"afterend:#monster-row-{previous_monster.id}"
+    else:
+        oob_swap = "afterend:#monster-list-header"
+    parts = [
+        render_block_to_string(
+            "modals_main.html", "monster-row", context={"monster": monster, "oob_swap": oob_swap}, request=request
+        )
+    ]
+    if previous_monster is None and not Monster.objects.exclude(id=monster.id).exists():
+        # Remove the "no monsters" message
+        parts.append(
+            render_block_to_string(
+                "modals_main.html", "monster-list-empty", context={"oob_swap": "delete"}, request=request
+            )
+        )
+    return "".join(parts)
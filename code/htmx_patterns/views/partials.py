@@ -4,8 +4,11 @@ from django.template.response import TemplateResponse
 from django.views.decorators.http import require_POST
 from render_block import render_block_to_string
 
+from ..cache_versions import count_cached
 from ..models import Monster
+from ..prefetch import prefetch_cached
 from ..utils import for_htmx
+from ..write_behind import apply_pending, set_happiness
 
 
 def toggle_with_separate_partials(request):
@@ -20,14 +23,16 @@ def toggle_with_separate_partials(request):
 
 @require_POST
 def toggle_item(request, monster_id):
-    monster = Monster.objects.get(id=monster_id)
-    monster.is_happy = not monster.is_happy
-    monster.save()
+    monster = apply_pending(Monster.objects.get(id=monster_id))
+    set_happiness(monster, not monster.is_happy)
     return TemplateResponse(request, "_toggle_item_partial.html", {"monster": monster})
 
 
 def get_page_by_request(request, queryset, paginate_by=6):
-    return Paginator(queryset, per_page=paginate_by).get_page(request.GET.get("page"))
+    paginator = Paginator(queryset, per_page=paginate_by)
+    # Avoid a COUNT query for every page, the count only changes when a Monster does
+    paginator.count = count_cached(queryset)
+    return paginator.get_page(request.GET.get("page"))
 
 
 def paging_with_separate_partials(request):
@@ -87,6 +92,8 @@ def paging_with_inline_partials_improved(request):
 # Similar to above, but with better Locality Of Behaviour,
 # because the template specifies the "internal routing"
 # of which block to use.
+# The template also prefetches the next page, see `prefetch_cached`
+@prefetch_cached(depends_on=[Monster])
 @for_htmx(use_block_from_params=True)
 def paging_with_inline_partials_improved_lob(request):
     return TemplateResponse(
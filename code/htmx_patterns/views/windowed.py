@@ -0,0 +1,59 @@
+from django.http import HttpRequest
+from django.template.response import TemplateResponse
+
+from ..cache_versions import count_cached
+from ..models import Monster
+from ..utils import for_htmx, is_htmx
+
+# Number of rows rendered per request
+WINDOW_SIZE = 50
+# Height of each row in pixels. All rows must be the same height.
+ROW_HEIGHT = 80
+
+
+@for_htmx(use_block="window")
+def windowed_list(request: HttpRequest):
+    # Only the fields needed by `_toggle_item_partial.html`
+    monsters = Monster.objects.order_by("id").only("id", "name", "is_happy")
+    total = count_cached(monsters)
+
+    if is_htmx(request) and "gap_start" in request.GET:
+        # A gap (placeholder for rows not yet loaded) has scrolled into view.
+        # We render the rows that are visible, and new gaps for the rest.
+        gap_start = _clamp(_get_int_param(request, "gap_start"), 0, total)
+        gap_end = _clamp(_get_int_param(request, "gap_end"), gap_start, total)
+        start = _clamp(
+            gap_start + _get_int_param(request, "visible_row"), gap_start, max(gap_end - WINDOW_SIZE, gap_start)
+        )
+    else:
+        gap_start, gap_end, start = 0, total, 0
+    end = min(start + WINDOW_SIZE, gap_end)
+
+    return TemplateResponse(
+        request,
+        "windowed_list.html",
+        {
+            "total": total,
+            "monsters": monsters[start:end],
+            "gap_before": _make_gap(gap_start, start),
+            "gap_after": _make_gap(end, gap_end),
+            "row_height": ROW_HEIGHT,
+        },
+    )
+
+
+def _make_gap(start: int, end: int) -> dict | None:
+    if end <= start:
+        return None
+    return {"start": start, "end": end, "height": (end - start) * ROW_HEIGHT}
+
+
+def _get_int_param(request: HttpRequest, name: str) -> int:
+    try:
+        return int(request.GET.get(name, 0))
+    except ValueError:
+        return 0
+
+
+def _clamp(value: int, low: int, high: int) -> int:
+    return max(low, min(value, high))
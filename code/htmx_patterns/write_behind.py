@@ -0,0 +1,149 @@
+"""
+Optional write coalescing for Monster happiness changes.
+
+When users spam-click toggle/kick/hug buttons, each click would normally be a
+separate UPDATE, contending for the database write lock. With
+WRITE_BEHIND_MODE = "delayed", changes are instead recorded in memory, merged
+per monster (so toggling twice is no change at all), and written in a single
+transaction at most WRITE_BEHIND_DELAY seconds later. Responses are rendered
+optimistically from the in-memory state.
+
+With WRITE_BEHIND_MODE = "sync" (the default), every change is saved
+immediately, as normal.
+
+Durability: in delayed mode, changes not yet flushed are lost if the process
+is killed (a clean shutdown flushes them). Other processes see changes only
+after the flush. Within this process, use `apply_pending` on monsters loaded
+from the database to see the latest state.
+
+Multiple worker processes: each process has its own pending changes. A toggle
+handled by another worker starts from the value in the database, which may be
+stale, so two toggles of the same monster in quick succession on different
+workers can cancel out, or both set the same value. Use sticky sessions, a
+single worker, or "sync" mode if that matters.
+"""
+
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from .cache_versions import bump_version
+from .models import Monster
+
+logger = logging.getLogger(__name__)
+
+# Keep well below SQLite's limit on query parameters
+UPDATE_BATCH_SIZE = 500
+
+_lock = threading.Lock()
+# Held for the whole of a flush, so that flushes can't overlap, and a later
+# flush can't commit before an earlier one.
+_flush_lock = threading.Lock()
+# monster id -> is_happy, changes not yet written
+_pending: dict[int, bool] = {}
+# monster id -> is_happy, changes being written but not yet committed
+_flushing: dict[int, bool] = {}
+_timer: threading.Timer | None = None
+_change_count = 0
+_atexit_registered = False
+
+
+def is_delayed() -> bool:
+    return getattr(settings, "WRITE_BEHIND_MODE", "sync") == "delayed"
+
+
+def apply_pending(monster: Monster) -> Monster:
+    """
+    Updates `monster` (loaded from the database) with any changes that
+    haven't been written yet. Returns the monster.
+    """
+    with _lock:
+        if monster.id in _pending:
+            monster.is_happy = _pending[monster.id]
+        elif monster.id in _flushing:
+            monster.is_happy = _flushing[monster.id]
+    return monster
+
+
+def set_happiness(monster: Monster, is_happy: bool):
+    """
+    Sets the happiness of the monster, writing it to the database immediately
+    or later, depending on WRITE_BEHIND_MODE.
+    """
+    global _change_count
+    monster.is_happy = is_happy
+    if not is_delayed():
+        monster.save(update_fields=["is_happy"])
+        return
+    with _lock:
+        _pending[monster.id] = is_happy
+        _change_count += 1
+        _schedule_flush()
+
+
+def flush():
+    """
+    Writes all pending changes to the database, in one transaction.
+    """
+    with _flush_lock:
+        _flush()
+
+
+def _flush():
+    global _timer, _change_count
+    with _lock:
+        _timer = None
+        if not _pending:
+            return
+        changes = dict(_pending)
+        change_count = _change_count
+        _flushing.update(changes)
+        _pending.clear()
+        _change_count = 0
+
+    try:
+        with transaction.atomic():
+            for is_happy in (True, False):
+                ids = [monster_id for monster_id, value in changes.items() if value == is_happy]
+                for i in range(0, len(ids), UPDATE_BATCH_SIZE):
+                    Monster.objects.filter(id__in=ids[i : i + UPDATE_BATCH_SIZE]).update(is_happy=is_happy)
+            # `update()` doesn't send signals
+            bump_version(Monster)
+    except Exception:
+        logger.exception("Failed to write %d monster changes, will retry", len(changes))
+        with _lock:
+            for monster_id, is_happy in changes.items():
+                # Newer changes take precedence
+                _pending.setdefault(monster_id, is_happy)
+            _change_count += change_count
+            _schedule_flush()
+    else:
+        logger.debug("Wrote %d monster changes from %d clicks", len(changes), change_count)
+    finally:
+        with _lock:
+            for monster_id in changes:
+                _flushing.pop(monster_id, None)
+
+
+def _schedule_flush():
+    # Must be called with _lock held
+    global _timer, _atexit_registered
+    if _timer is not None:
+        return
+    if not _atexit_registered:
+        atexit.register(flush)
+        _atexit_registered = True
+    _timer = threading.Timer(getattr(settings, "WRITE_BEHIND_DELAY", 0.5), _flush_in_thread)
+    _timer.daemon = True
+    _timer.start()
+
+
+def _flush_in_thread():
+    try:
+        flush()
+    finally:
+        # Database connections are per thread
+        connections.close_all()